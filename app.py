@@ -1,27 +1,50 @@
 """
 Flask Automated HTML Testing Application - Refactored
-Install: pip install flask selenium beautifulsoup4
+Install: pip install flask "selenium>=4.6" beautifulsoup4 (optional: orjson)
+Production: gunicorn -c gunicorn.conf.py wsgi:application
 """
 
+import atexit
+import base64
+import hashlib
+import itertools
 import json
 import logging
 import os
+import queue
+import re
 import shutil
+import socket
+import string
 import subprocess
+import tempfile
 import time
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass, asdict
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed, wait
+from dataclasses import dataclass, asdict, replace
 import threading
 
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify, send_file
+from flask.json.provider import DefaultJSONProvider
 from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.common.action_chains import ActionChains
 from selenium.webdriver.common.by import By
+from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
+from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import WebDriverException
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+try:
+    import orjson  # optional, faster JSON parsing
+except ImportError:
+    orjson = None
 
 # Configuration
 class Config:
@@ -29,15 +52,28 @@ class Config:
     REPORTS_FOLDER = 'test_reports'
     SCREENSHOTS_FOLDER = 'screenshots'
     RECORDINGS_FOLDER = 'recordings'
+    INLINE_SCREENSHOT_MAX_BYTES = 500 * 1024  # larger screenshots stay linked by path in HTML reports
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
     CUSTOM_GECKO_WINDOWS = r"C:\Drivers\Firefox\geckodriver.exe"
     CUSTOM_EDGE_LINUX = r"/home/pranav/Downloads/edgedriver_linux64/msedgedriver"
     SUPPORTED_BROWSERS = ["chrome", "firefox", "edge", "all"]
     DEFAULT_TIMEOUT = 10
-    ACTION_DELAY = 0.5
+    STATUS_STREAM_KEEPALIVE = 15  # seconds between SSE keep-alive comments on /test_status streams
+    POLL_FREQUENCY = 0.1  # seconds between WebDriverWait condition checks
+    PAGE_LOAD_STRATEGY = 'eager'  # driver.get() returns at DOMContentLoaded
+    BATCH_DOM_ACTIONS = True  # run consecutive read-only DOM actions in one execute_script call
+    ACTION_DELAY = 0.5  # default duration (s) of a 'wait' action without 'duration'
     ENABLE_VIDEO_RECORDING = True
     PARALLEL_EXECUTION = True
     MAX_PARALLEL_TESTS = 3
+    BROWSER_POOL_RECYCLE_AFTER = 100  # quit a pooled driver after this many test runs
+    PREWARM_BROWSERS = []  # e.g. ["chrome"]; launched headless when the driver pool starts
+    # Run Chrome tests as tabs of one shared browser. Tabs share cookies and storage, and
+    # window_handles lists every tab in that browser, so switch_to_window indexes can land
+    # in another test's tab: only enable it for suites that never switch windows.
+    SHARE_BROWSER = False
+    CHROME_BINARY = "google-chrome"
+    SHARED_CHROME_PORT = 9222
 
 # Logging setup
 logging.basicConfig(
@@ -46,11 +82,127 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Test execution tracking
+def json_loads(data) -> Any:
+    """Parse JSON text or bytes, using orjson when it is installed"""
+    return orjson.loads(data) if orjson else json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize to compact UTF-8 JSON bytes, using orjson when it is installed"""
+    if orjson:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that encodes jsonify() responses with orjson"""
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any):
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
+
+_now_cache = (0, '')
+
+
+def _now_str() -> str:
+    """Current local time as 'YYYY-MM-DD HH:MM:SS', formatted at most once per second"""
+    global _now_cache
+    second = int(time.time())
+    cached_second, text = _now_cache
+    if cached_second != second:
+        text = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+        _now_cache = (second, text)  # tuple swap keeps second and text consistent across threads
+    return text
+
+
+# Characters not allowed in test names (anything but letters, digits, space, '_' and '-')
+_UNSAFE_NAME_CHARS = re.compile(r"[^\w \-]+")
+# Same rule as a str.translate table for the common all-ASCII case
+_ALLOWED_NAME_CHARS = frozenset(string.ascii_letters + string.digits + " _-")
+_ASCII_NAME_TABLE = str.maketrans('', '', ''.join(chr(i) for i in range(128) if chr(i) not in _ALLOWED_NAME_CHARS))
+
+
+# Background file writes, drained by one daemon writer thread per process
+_io_queue = queue.Queue()
+_io_thread_pid = None
+_io_lock = threading.Lock()
+
+
+def _io_worker() -> None:
+    while True:
+        func, args, future = _io_queue.get()
+        try:
+            future.set_result(func(*args))
+        except Exception as e:
+            logger.error("Background write failed: %s", e)
+            future.set_exception(e)
+        finally:
+            _io_queue.task_done()
+
+
+def submit_io(func, *args) -> Future:
+    """Queue a file write for the background writer thread; the future completes once it ran"""
+    global _io_thread_pid
+    if _io_thread_pid != os.getpid():
+        # Started lazily (and per PID) so forked workers get their own writer
+        with _io_lock:
+            if _io_thread_pid != os.getpid():
+                threading.Thread(target=_io_worker, name="atf-io", daemon=True).start()
+                _io_thread_pid = os.getpid()
+    future = Future()
+    _io_queue.put((func, args, future))
+    return future
+
+
+def flush_io() -> None:
+    """Block until every queued background write has finished"""
+    _io_queue.join()
+
+
+atexit.register(flush_io)
+
+
+# Process umask, read once at import (os.umask can only be queried by setting it)
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def write_atomic(path: Path, write) -> None:
+    """Write a file through a temporary sibling so readers never see it half-written"""
+    # mkstemp creates 0600; keep the mode open() would give (or the file already has)
+    try:
+        mode = path.stat().st_mode & 0o777
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            os.fchmod(f.fileno(), mode)
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+# Shared worker threads for browser test runs (threads start lazily on first submit)
+_TEST_EXECUTOR = ThreadPoolExecutor(max_workers=Config.MAX_PARALLEL_TESTS, thread_name_prefix="atf-test")
+atexit.register(_TEST_EXECUTOR.shutdown)
+
+# Test execution tracking; entries are immutable snapshots swapped in under test_lock
 active_tests = {}
 test_lock = threading.Lock()
+status_changed = threading.Condition(test_lock)  # notified whenever a snapshot is replaced
 
-@dataclass
+@dataclass(frozen=True)
 class TestStatus:
     """Track test execution status"""
     test_name: str
@@ -63,125 +215,484 @@ class TestStatus:
     def to_dict(self):
         return asdict(self)
 
+
+def _update_status(test_name: str, **changes: Any) -> None:
+    """Replace a test's status snapshot; readers never need the lock"""
+    with test_lock:
+        status = active_tests.get(test_name)
+        if status:
+            active_tests[test_name] = replace(status, **changes)
+            status_changed.notify_all()
+
 # Initialize Flask app
 app = Flask(__name__)
 app.config.from_object(Config)
+if orjson:
+    app.json = ORJSONProvider(app)
+
+# Resolve folder paths once instead of on every request
+UPLOAD_DIR = Path(Config.UPLOAD_FOLDER)
+REPORTS_DIR = Path(Config.REPORTS_FOLDER)
+SCREENSHOTS_DIR = Path(Config.SCREENSHOTS_FOLDER)
+RECORDINGS_DIR = Path(Config.RECORDINGS_FOLDER)
 
 # Create necessary directories
-for folder in [Config.UPLOAD_FOLDER, Config.REPORTS_FOLDER, Config.SCREENSHOTS_FOLDER, Config.RECORDINGS_FOLDER]:
-    Path(folder).mkdir(exist_ok=True)
+for folder in [UPLOAD_DIR, REPORTS_DIR, SCREENSHOTS_DIR, RECORDINGS_DIR]:
+    folder.mkdir(exist_ok=True)
+
+# Screen recording tools, looked up once instead of on every test run
+_FFMPEG_PATH = shutil.which('ffmpeg') if Config.ENABLE_VIDEO_RECORDING else None
+_RECORDER_PATH = shutil.which('wf-recorder') if Config.ENABLE_VIDEO_RECORDING else None
+
+
+# Command-line arguments applied to every browser launch
+_CHROMIUM_BASE_ARGS = ("--disable-gpu", "--no-sandbox", "--disable-dev-shm-usage", "--window-size=1920,1080")
+_FIREFOX_BASE_ARGS = ("--width=1920", "--height=1080")
 
 
 class BrowserManager:
     """Manages browser driver setup and configuration"""
     
+    # Requires selenium>=4.6 (Selenium Manager resolves drivers when no service path is set).
+    # keep_alive=True keeps one HTTP connection to the driver process for every command.
+    
+    _shared_chrome = {}  # headless -> Popen of the shared Chrome process
+    _shared_chrome_lock = threading.Lock()
+    _attached_tabs = {}  # attached driver -> window handle of the tab it owns
+    
+    @staticmethod
+    def _ensure_shared_chrome(headless: bool) -> str:
+        """Start the shared Chrome process if needed and return its debugger address"""
+        port = Config.SHARED_CHROME_PORT + int(headless)
+        with BrowserManager._shared_chrome_lock:
+            process = BrowserManager._shared_chrome.get(headless)
+            if process is None or process.poll() is not None:
+                args = [
+                    Config.CHROME_BINARY,
+                    f"--remote-debugging-port={port}",
+                    f"--user-data-dir={Path(tempfile.gettempdir()) / f'atf-shared-{port}'}",
+                    "--no-first-run",
+                    *_CHROMIUM_BASE_ARGS,
+                ]
+                if headless:
+                    args.append("--headless=new")
+                process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                BrowserManager._shared_chrome[headless] = process
+                atexit.register(process.terminate)
+                
+                deadline = time.time() + Config.DEFAULT_TIMEOUT
+                while True:
+                    try:
+                        socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+                        break
+                    except OSError:
+                        if time.time() > deadline:
+                            raise WebDriverException(f"Shared Chrome did not open port {port}")
+                        time.sleep(0.1)
+                logger.info("Shared Chrome started on port %s", port)
+        return f"127.0.0.1:{port}"
+    
+    @staticmethod
+    def attach_shared_chrome(headless: bool) -> webdriver.Chrome:
+        """Attach to the shared Chrome and open a tab owned by the new session"""
+        options = ChromeOptions()
+        options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
+        options.debugger_address = BrowserManager._ensure_shared_chrome(headless)
+        
+        driver = webdriver.Chrome(options=options, keep_alive=True)
+        # Sessions see all tabs of the shared browser (see Config.SHARE_BROWSER)
+        driver.switch_to.new_window('tab')
+        BrowserManager._attached_tabs[driver] = driver.current_window_handle
+        return driver
+    
+    @staticmethod
+    def quit_driver(driver: webdriver.Remote) -> None:
+        """Quit a driver, closing only its own tab when attached to the shared Chrome"""
+        tab = BrowserManager._attached_tabs.pop(driver, None)
+        if tab is not None:
+            driver.switch_to.window(tab)
+            driver.close()
+        driver.quit()
+    
     @staticmethod
     def setup_chrome(headless: bool) -> webdriver.Chrome:
         """Setup Chrome WebDriver"""
-        from selenium.webdriver.chrome.options import Options
+        if Config.SHARE_BROWSER:
+            return BrowserManager.attach_shared_chrome(headless)
         
-        options = Options()
+        options = ChromeOptions()
+        options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
         if headless:
             options.add_argument("--headless=new")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
+        for arg in _CHROMIUM_BASE_ARGS:
+            options.add_argument(arg)
         
-        return webdriver.Chrome(options=options)
+        return webdriver.Chrome(options=options, keep_alive=True)
     
     @staticmethod
     def setup_firefox(headless: bool) -> webdriver.Firefox:
         """Setup Firefox WebDriver"""
-        from selenium.webdriver.firefox.options import Options
-        from selenium.webdriver.firefox.service import Service
-        
-        options = Options()
+        options = FirefoxOptions()
+        options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
         if headless:
             options.add_argument("--headless")
-        options.add_argument("--width=1920")
-        options.add_argument("--height=1080")
+        for arg in _FIREFOX_BASE_ARGS:
+            options.add_argument(arg)
         
         service_path = Config.CUSTOM_GECKO_WINDOWS
-        service = Service(service_path) if os.name == "nt" and Path(service_path).exists() else Service()
+        service = FirefoxService(service_path) if os.name == "nt" and Path(service_path).exists() else FirefoxService()
         
-        return webdriver.Firefox(service=service, options=options)
+        return webdriver.Firefox(service=service, options=options, keep_alive=True)
     
     @staticmethod
     def setup_edge(headless: bool) -> webdriver.Edge:
         """Setup Edge WebDriver"""
-        from selenium.webdriver.edge.options import Options
-        from selenium.webdriver.edge.service import Service
-        
-        options = Options()
+        options = EdgeOptions()
+        options.page_load_strategy = Config.PAGE_LOAD_STRATEGY
         
         if headless:
             options.add_argument("--headless=new")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
+        for arg in _CHROMIUM_BASE_ARGS:
+            options.add_argument(arg)
         
         # Linux-specific Edge driver configuration
         service_path = Config.CUSTOM_EDGE_LINUX
         if os.name != "nt" and Path(service_path).exists():
             if not os.access(service_path, os.X_OK):
-                logger.warning(f"Edge driver not executable. Run: chmod +x {service_path}")
-            service = Service(executable_path=service_path)
+                logger.warning("Edge driver not executable. Run: chmod +x %s", service_path)
+            service = EdgeService(executable_path=service_path)
         else:
-            service = Service()
+            service = EdgeService()
+        
+        return webdriver.Edge(service=service, options=options, keep_alive=True)
+    
+    @staticmethod
+    def create_driver(browser: str, headless: bool) -> webdriver.Remote:
+        """Launch a new WebDriver for the given browser"""
+        factory = _BROWSER_FACTORIES.get(browser)
+        if factory is None:
+            raise ValueError(f"Unsupported browser: {browser}")
+        return factory(headless)
+
+
+_BROWSER_FACTORIES = {
+    "chrome": BrowserManager.setup_chrome,
+    "firefox": BrowserManager.setup_firefox,
+    "edge": BrowserManager.setup_edge,
+}
+
+
+class DriverPool:
+    """Keeps idle WebDriver sessions alive so tests skip browser cold-start"""
+    
+    # Clears web storage for the current origin; about:blank has none and throws
+    _CLEAR_STORAGE_SCRIPT = "try { localStorage.clear(); sessionStorage.clear(); } catch (e) {}"
+    
+    def __init__(self, max_idle: int = Config.MAX_PARALLEL_TESTS,
+                 recycle_after: int = Config.BROWSER_POOL_RECYCLE_AFTER):
+        self.max_idle = max_idle
+        self.recycle_after = recycle_after
+        self._pools = {}  # (browser, headless) -> queue.Queue of idle drivers
+        self._uses = {}  # driver -> number of completed test runs
+        self._home_windows = {}  # driver -> handle of the window it was created with
+        self._lock = threading.Lock()
+    
+    def _pool(self, browser: str, headless: bool) -> queue.Queue:
+        with self._lock:
+            return self._pools.setdefault((browser, headless), queue.Queue(maxsize=self.max_idle))
+    
+    def _create(self, browser: str, headless: bool) -> webdriver.Remote:
+        driver = BrowserManager.create_driver(browser, headless)
+        try:
+            home = driver.current_window_handle
+        except Exception:
+            BrowserManager.quit_driver(driver)
+            raise
+        with self._lock:
+            self._home_windows[driver] = home
+        return driver
+    
+    def acquire(self, browser: str, headless: bool) -> webdriver.Remote:
+        """Check out an idle driver, launching a new one if none is available"""
+        pool = self._pool(browser, headless)
+        while True:
+            try:
+                driver = pool.get_nowait()
+            except queue.Empty:
+                return self._create(browser, headless)
+            try:
+                driver.current_window_handle  # liveness probe: the browser may have died while idle
+            except Exception as e:
+                logger.warning("Discarding dead pooled %s driver: %s", browser, e)
+                self._quit(driver)
+                continue
+            logger.info("Reusing pooled %s driver (headless=%s)", browser, headless)
+            return driver
+    
+    def prewarm(self, browser: str, headless: bool, count: int) -> None:
+        """Launch idle drivers on background threads so the first tests skip cold-start"""
+        def launch():
+            try:
+                driver = self._create(browser, headless)
+            except Exception as e:
+                logger.warning("Could not prewarm %s driver: %s", browser, e)
+                return
+            try:
+                self._pool(browser, headless).put_nowait(driver)
+            except queue.Full:
+                self._quit(driver)
+        
+        for _ in range(min(count, self.max_idle)):
+            threading.Thread(target=launch, daemon=True).start()
+    
+    def release(self, driver: webdriver.Remote, browser: str, headless: bool) -> None:
+        """Reset a driver and return it to the pool, quitting it if that fails"""
+        with self._lock:
+            uses = self._uses.get(driver, 0) + 1
+            self._uses[driver] = uses
+        if uses >= self.recycle_after:
+            logger.info("Recycling %s driver after %s runs", browser, uses)
+            self._quit(driver)
+            return
         
-        return webdriver.Edge(service=service, options=options)
+        try:
+            self._reset(driver)
+            self._pool(browser, headless).put_nowait(driver)
+        except Exception as e:
+            if not isinstance(e, queue.Full):
+                logger.warning("Discarding %s driver: %s", browser, e)
+            self._quit(driver)
+    
+    def _reset(self, driver: webdriver.Remote) -> None:
+        """Clear state left behind by the previous test"""
+        owned_tab = BrowserManager._attached_tabs.get(driver)
+        if owned_tab is not None:
+            driver.switch_to.window(owned_tab)
+        else:
+            # Close popups/tabs the test opened and go back to the original window
+            # (window_handles has no guaranteed order, so the original is tracked)
+            home = self._home_windows[driver]
+            for handle in driver.window_handles:
+                if handle != home:
+                    driver.switch_to.window(handle)
+                    driver.close()
+            driver.switch_to.window(home)
+        if owned_tab is None and hasattr(driver, 'execute_cdp_cmd'):
+            # Chromium: drop cookies for every origin, not just the current page.
+            # Not for shared-browser tabs, where it would wipe other running tests' cookies
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        else:
+            driver.delete_all_cookies()
+        driver.execute_script(self._CLEAR_STORAGE_SCRIPT)
+        driver.get("about:blank")
+    
+    def shutdown_all(self) -> None:
+        """Quit every idle driver"""
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            while True:
+                try:
+                    self._quit(pool.get_nowait())
+                except queue.Empty:
+                    break
+    
+    def _quit(self, driver: webdriver.Remote) -> None:
+        with self._lock:
+            self._uses.pop(driver, None)
+            self._home_windows.pop(driver, None)
+        try:
+            BrowserManager.quit_driver(driver)
+        except Exception as e:
+            logger.error("Error quitting driver: %s", e)
+
+
+_driver_pool = None
+_driver_pool_pid = None
+_driver_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Return this process's driver pool, creating it on first use.
+    
+    Created lazily (and per PID) so every forked WSGI worker owns its own drivers.
+    """
+    global _driver_pool, _driver_pool_pid
+    if _driver_pool_pid != os.getpid():
+        with _driver_pool_lock:
+            if _driver_pool_pid != os.getpid():
+                _driver_pool = DriverPool()
+                _driver_pool_pid = os.getpid()
+                atexit.register(_driver_pool.shutdown_all)
+                for browser in Config.PREWARM_BROWSERS:
+                    _driver_pool.prewarm(browser, True, Config.MAX_PARALLEL_TESTS)
+    return _driver_pool
 
 
 class ActionExecutor:
     """Executes individual test actions"""
     
+    # Actions that leave the page as it was; after any other action a selector may
+    # match a different node (or context), so cached element references are dropped
+    PAGE_PRESERVING_ACTIONS = frozenset({
+        'verify_text', 'verify_exists', 'verify_visible', 'verify_url', 'store_text', 'screenshot'
+    })
+    
+    # Read-only actions (plus scroll_to, whose handler is the same scrollIntoView call)
+    # that can be executed together by _BATCH_SCRIPT. Input, select, clicks and hovers
+    # stay out: setting values or firing synthetic events from JS skips Selenium's
+    # interactability checks, key events and framework value tracking. verify_visible
+    # stays out too, as only Selenium's is_displayed atom gives its exact semantics
+    BATCHABLE_ACTIONS = frozenset({
+        'verify_text', 'verify_exists', 'store_text', 'scroll_to'
+    })
+    
+    # Applies a list of action descriptors in order and returns one entry per
+    # completed action, stopping at the first one it cannot satisfy.
+    _BATCH_SCRIPT = r"""
+        const done = [];
+        for (const a of arguments[0]) {
+            const el = document.querySelector(a.selector);
+            if (!el) break;
+            if (a.type === 'verify_text') {
+                // innerText of a non-rendered element is its full text content, where
+                // Selenium's element.text is '': leave those to the regular handler
+                if (el.getClientRects().length === 0) break;
+                const text = el.innerText || el.value || '';
+                if (!text.includes(a.expected)) break;
+            } else if (a.type === 'store_text') {
+                if (el.getClientRects().length === 0) break;  // same as verify_text
+                a.text = el.innerText || el.value || '';
+            } else if (a.type === 'scroll_to') {
+                el.scrollIntoView({behavior: 'smooth', block: 'center'});
+            }
+            done.push(a);
+        }
+        return done;
+    """
+    
+    # Locator condition -> equivalent check on an already-found element (None: no check needed)
+    _CACHED_CONDITIONS = {
+        EC.presence_of_element_located: None,
+        EC.element_to_be_clickable: EC.element_to_be_clickable,
+        EC.visibility_of_element_located: EC.visibility_of,
+    }
+    
+    # ${name} placeholders in input values; names are free-form, as in the "variable" field
+    _VAR_RE = re.compile(r"\$\{([^}]+)\}")
+    
     def __init__(self, driver: webdriver.Remote):
         self.driver = driver
         self.variables = {}  # Store variables for later use
+        self._wait = WebDriverWait(driver, Config.DEFAULT_TIMEOUT, poll_frequency=Config.POLL_FREQUENCY)
+        self._element_cache = {}  # selector -> WebElement
+        self._pending_writes = []  # futures of this executor's queued screenshot writes
     
-    def execute(self, action: Dict[str, Any]) -> Dict[str, Any]:
-        """Execute a single test action and return result"""
-        result = {
+    @staticmethod
+    def _new_result(action: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the default (failed) result record for an action"""
+        return {
             'action': action['type'],
             'selector': action.get('selector', ''),
             'status': 'failed',
             'message': '',
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time(),  # formatted once the run has finished
             'screenshot': None
         }
+    
+    def is_batchable(self, action: Dict[str, Any]) -> bool:
+        """Whether an action can run inside a batched execute_script call"""
+        return (Config.BATCH_DOM_ACTIONS and action.get('type') in self.BATCHABLE_ACTIONS
+                and not action.get('delay'))
+    
+    def execute_batch(self, actions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Run consecutive read-only DOM actions in a single round-trip.
+        
+        Returns results for the leading actions that completed in the browser.
+        The batch stops at the first action that cannot be satisfied immediately
+        (missing element, text mismatch, ...); that action and the rest are left
+        to the regular handlers, which wait and report failures.
+        """
+        descriptors = [{
+            'type': a['type'],
+            'selector': a.get('selector'),
+            'expected': a.get('expected', ''),
+            'variable': a.get('variable', 'stored_text')
+        } for a in actions]
+        
+        try:
+            outcomes = self.driver.execute_script(self._BATCH_SCRIPT, descriptors)
+        except Exception as e:
+            logger.warning("Batch execution failed, falling back to single actions: %s", e)
+            return []
+        
+        outcomes = outcomes or []
+        if any(a['type'] not in self.PAGE_PRESERVING_ACTIONS for a in outcomes):
+            self._element_cache.clear()
+        
+        results = []
+        for action, descriptor in zip(actions, outcomes):
+            result = self._new_result(action)
+            result['status'] = 'passed'
+            if action['type'] == 'verify_text':
+                result['message'] = f"Text verification passed: '{action.get('expected', '')}' found"
+            elif action['type'] == 'store_text':
+                self.variables[descriptor['variable']] = descriptor['text']
+                result['message'] = f"Stored text '{descriptor['text']}' in variable '{descriptor['variable']}'"
+            elif action['type'] == 'scroll_to':
+                result['message'] = 'Scrolled to element'
+            else:
+                result['message'] = 'Element exists'
+            results.append(result)
+        return results
+    
+    def execute(self, action: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a single test action and return result.
+        
+        Besides its type-specific fields, any action may set "delay" (ms) to pause
+        after it runs; there is no implicit pause between actions.
+        """
+        result = self._new_result(action)
         
         try:
             action_type = action['type']
-            handler = getattr(self, f"_handle_{action_type}", None)
+            handler = self._HANDLERS.get(action_type)
             
             if handler:
-                handler(action, result)
+                try:
+                    handler(self, action, result)
+                except StaleElementReferenceException:
+                    # Cached element went stale (e.g. after navigation); retry once with a fresh lookup
+                    self._element_cache.pop(action.get('selector'), None)
+                    handler(self, action, result)
             else:
                 result['message'] = f"Unknown action type: {action_type}"
                 
         except Exception as e:
             result['message'] = str(e)
             result['screenshot'] = self._capture_screenshot(action)
-            logger.error(f"Action failed - {action.get('type')}: {e}")
+            logger.error("Action failed - %s: %s", action.get('type'), e)
+        
+        # Also after a failure: the action may have changed the page before raising
+        if action.get('type') not in self.PAGE_PRESERVING_ACTIONS:
+            self._element_cache.clear()
+        
+        # Optional per-action pause in ms, e.g. to slow a run down for demos
+        if action.get('delay'):
+            time.sleep(action['delay'] / 1000)
         
         return result
     
     def _handle_click(self, action: Dict, result: Dict) -> None:
         """Handle click action"""
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'], EC.element_to_be_clickable)
         element.click()
         result['status'] = 'passed'
         result['message'] = 'Element clicked successfully'
     
     def _handle_input(self, action: Dict, result: Dict) -> None:
         """Handle input action"""
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'])
         element.clear()
         value = self._substitute_variables(action['value'])
         element.send_keys(value)
@@ -190,18 +701,14 @@ class ActionExecutor:
     
     def _handle_select(self, action: Dict, result: Dict) -> None:
         """Handle select dropdown action"""
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'])
         Select(element).select_by_value(action['value'])
         result['status'] = 'passed'
         result['message'] = f"Selected value: '{action['value']}'"
     
     def _handle_verify_text(self, action: Dict, result: Dict) -> None:
         """Handle text verification"""
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'])
         text = element.text or element.get_attribute("value") or ""
         expected = action.get("expected", "")
         
@@ -213,17 +720,17 @@ class ActionExecutor:
     
     def _handle_verify_exists(self, action: Dict, result: Dict) -> None:
         """Handle element existence verification"""
-        WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, action['selector']))
+        # Only a boolean is needed, so poll in-page instead of fetching an element reference
+        self._wait.until(
+            lambda d: d.execute_script("return !!document.querySelector(arguments[0])", action['selector']),
+            f"No element matches '{action['selector']}'"
         )
         result['status'] = 'passed'
         result['message'] = 'Element exists'
     
     def _handle_verify_visible(self, action: Dict, result: Dict) -> None:
         """Handle visibility verification"""
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.visibility_of_element_located((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'], EC.visibility_of_element_located)
         if element.is_displayed():
             result['status'] = 'passed'
             result['message'] = 'Element is visible'
@@ -232,26 +739,21 @@ class ActionExecutor:
     
     def _handle_wait(self, action: Dict, result: Dict) -> None:
         """Handle wait action"""
-        duration = action.get('duration', 1000) / 1000
+        duration = action.get('duration', Config.ACTION_DELAY * 1000) / 1000
         time.sleep(duration)
         result['status'] = 'passed'
         result['message'] = f'Waited {duration}s'
     
     def _handle_hover(self, action: Dict, result: Dict) -> None:
         """Handle hover/mouse over action"""
-        from selenium.webdriver.common.action_chains import ActionChains
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'])
         ActionChains(self.driver).move_to_element(element).perform()
         result['status'] = 'passed'
         result['message'] = 'Hovered over element'
     
     def _handle_scroll_to(self, action: Dict, result: Dict) -> None:
         """Handle scroll to element action"""
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'])
         self.driver.execute_script("arguments[0].scrollIntoView({behavior: 'smooth', block: 'center'});", element)
         result['status'] = 'passed'
         result['message'] = 'Scrolled to element'
@@ -272,9 +774,7 @@ class ActionExecutor:
     
     def _handle_store_text(self, action: Dict, result: Dict) -> None:
         """Store element text in a variable"""
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'])
         text = element.text or element.get_attribute("value") or ""
         var_name = action.get('variable', 'stored_text')
         self.variables[var_name] = text
@@ -294,20 +794,14 @@ class ActionExecutor:
     
     def _handle_double_click(self, action: Dict, result: Dict) -> None:
         """Handle double click action"""
-        from selenium.webdriver.common.action_chains import ActionChains
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'], EC.element_to_be_clickable)
         ActionChains(self.driver).double_click(element).perform()
         result['status'] = 'passed'
         result['message'] = 'Element double-clicked successfully'
     
     def _handle_right_click(self, action: Dict, result: Dict) -> None:
         """Handle right click (context menu) action"""
-        from selenium.webdriver.common.action_chains import ActionChains
-        element = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, action['selector']))
-        )
+        element = self._get_element(action['selector'], EC.element_to_be_clickable)
         ActionChains(self.driver).context_click(element).perform()
         result['status'] = 'passed'
         result['message'] = 'Element right-clicked successfully'
@@ -316,9 +810,7 @@ class ActionExecutor:
         """Switch to iframe"""
         frame_selector = action.get('selector', '')
         if frame_selector:
-            frame = WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, frame_selector))
-            )
+            frame = self._get_element(frame_selector)
             self.driver.switch_to.frame(frame)
         else:
             self.driver.switch_to.default_content()
@@ -336,25 +828,57 @@ class ActionExecutor:
         else:
             result['message'] = f'Invalid window index: {window_index}'
     
+    def _get_element(self, selector: str, condition=EC.presence_of_element_located):
+        """Locate an element by CSS selector, reusing earlier lookups where possible"""
+        element = self._element_cache.get(selector)
+        if element is not None and condition in self._CACHED_CONDITIONS:
+            # Re-check state on the cached element instead of finding it again;
+            # a stale reference raises and execute() retries with a fresh lookup
+            recheck = self._CACHED_CONDITIONS[condition]
+            return element if recheck is None else self._wait.until(recheck(element))
+        element = self._wait.until(condition((By.CSS_SELECTOR, selector)))
+        self._element_cache[selector] = element
+        return element
+    
     def _substitute_variables(self, value: str) -> str:
         """Replace variable placeholders with actual values"""
-        if isinstance(value, str):
-            for var_name, var_value in self.variables.items():
-                value = value.replace(f"${{{var_name}}}", str(var_value))
-        return value
+        if not self.variables or not isinstance(value, str):
+            return value
+        return self._VAR_RE.sub(lambda m: str(self.variables.get(m.group(1), m.group(0))), value)
     
     def _capture_screenshot(self, action: Dict, prefix: str = 'failure') -> Optional[str]:
         """Capture screenshot on failure or manual request"""
         try:
             timestamp = int(time.time())
             filename = f"{prefix}_{timestamp}_{action.get('type', 'unknown')}.png"
-            filepath = Path(Config.SCREENSHOTS_FOLDER) / filename
-            self.driver.save_screenshot(str(filepath))
-            logger.info(f"Screenshot saved: {filepath}")
+            filepath = SCREENSHOTS_DIR / filename
+            png = self.driver.get_screenshot_as_png()
+            self._pending_writes.append(submit_io(self._write_screenshot, filepath, png))
             return str(filepath)
         except Exception as e:
-            logger.error(f"Failed to save screenshot: {e}")
+            logger.error("Failed to save screenshot: %s", e)
             return None
+    
+    @staticmethod
+    def _write_screenshot(filepath: Path, png: bytes) -> None:
+        try:
+            filepath.write_bytes(png)
+            logger.debug("Screenshot saved: %s", filepath)
+        except Exception as e:
+            logger.error("Failed to save screenshot: %s", e)
+    
+    def close(self) -> None:
+        """Wait for this executor's pending screenshot writes"""
+        wait(self._pending_writes)
+        self._pending_writes.clear()
+
+
+# Action type -> handler, built once instead of a getattr lookup per action
+ActionExecutor._HANDLERS = {
+    name[len("_handle_"):]: handler
+    for name, handler in vars(ActionExecutor).items()
+    if name.startswith("_handle_")
+}
 
 
 class TestRunner:
@@ -366,22 +890,16 @@ class TestRunner:
         self.driver = None
         self.test_name = test_name
         self.recording_process = None
+        self.executor = None
     
     def setup_driver(self) -> None:
         """Initialize WebDriver"""
-        logger.info(f"Setting up {self.browser} driver (headless={self.headless})")
+        logger.info("Setting up %s driver (headless=%s)", self.browser, self.headless)
         
         try:
-            if self.browser == "chrome":
-                self.driver = BrowserManager.setup_chrome(self.headless)
-            elif self.browser == "firefox":
-                self.driver = BrowserManager.setup_firefox(self.headless)
-            elif self.browser == "edge":
-                self.driver = BrowserManager.setup_edge(self.headless)
-            else:
-                raise ValueError(f"Unsupported browser: {self.browser}")
+            self.driver = get_driver_pool().acquire(self.browser, self.headless)
         except WebDriverException as e:
-            logger.error(f"Failed to initialize {self.browser}: {e}")
+            logger.error("Failed to initialize %s: %s", self.browser, e)
             raise
     
     def start_recording(self) -> None:
@@ -389,28 +907,25 @@ class TestRunner:
         if not Config.ENABLE_VIDEO_RECORDING or self.headless:
             return
         
+        if not _FFMPEG_PATH or not _RECORDER_PATH:
+            logger.warning("ffmpeg/wf-recorder not found. Video recording disabled.")
+            return
+        
         try:
-            import subprocess
             timestamp = int(time.time())
-            video_path = Path(Config.RECORDINGS_FOLDER) / f"{self.test_name}_{self.browser}_{timestamp}.mp4"
-            
-            # Check if ffmpeg is available
-            result = subprocess.run(['which', 'ffmpeg'], capture_output=True)
-            if result.returncode != 0:
-                logger.warning("ffmpeg not found. Video recording disabled.")
-                return
+            video_path = RECORDINGS_DIR / f"{self.test_name}_{self.browser}_{timestamp}.mp4"
             
             # Start screen recording (Linux X11)
             self.recording_process = subprocess.Popen([
-                'wf-recorder',
+                _RECORDER_PATH,
                 '-f', str(video_path),
                 '-r', '30'
             ])
 
             
-            logger.info(f"Recording started: {video_path}")
+            logger.info("Recording started: %s", video_path)
         except Exception as e:
-            logger.warning(f"Could not start recording: {e}")
+            logger.warning("Could not start recording: %s", e)
     
     def stop_recording(self) -> None:
         """Stop video recording"""
@@ -420,65 +935,88 @@ class TestRunner:
                 self.recording_process.wait(timeout=5)
                 logger.info("Recording stopped")
             except Exception as e:
-                logger.error(f"Error stopping recording: {e}")
+                logger.error("Error stopping recording: %s", e)
     
     def cleanup(self) -> None:
-        """Clean up WebDriver resources"""
+        """Return the WebDriver to the pool"""
         self.stop_recording()
         if self.driver:
-            try:
-                self.driver.quit()
-            except Exception as e:
-                logger.error(f"Error during cleanup: {e}")
+            get_driver_pool().release(self.driver, self.browser, self.headless)
+            self.driver = None
+        # Screenshots are already captured, so the driver goes back before waiting on disk
+        if self.executor:
+            self.executor.close()
+    
+    def _wait_ready(self) -> None:
+        """Block until the loaded document has finished parsing"""
+        WebDriverWait(self.driver, Config.DEFAULT_TIMEOUT, poll_frequency=Config.POLL_FREQUENCY).until(
+            lambda d: d.execute_script("return document.readyState") in ("interactive", "complete")
+        )
     
     def run(self, html_path: str, json_path: str) -> Dict[str, Any]:
         """Execute complete test suite"""
         try:
+            # Load and validate test actions before paying for a browser
+            actions = TestManager.load_actions(json_path)
+            
             self.setup_driver()
             self.start_recording()
             
             # Load HTML file
             file_url = f"file://{Path(html_path).resolve()}"
-            logger.info(f"Loading URL: {file_url}")
+            logger.info("Loading URL: %s", file_url)
             self.driver.get(file_url)
-            time.sleep(1)
-            
-            # Load test actions
-            with open(json_path, 'r', encoding='utf-8') as f:
-                actions = json.load(f)
+            self._wait_ready()
             
             # Update test status
-            with test_lock:
-                if self.test_name in active_tests:
-                    active_tests[self.test_name].total = len(actions)
+            _update_status(self.test_name, total=len(actions))
             
             # Execute actions
-            executor = ActionExecutor(self.driver)
+            executor = self.executor = ActionExecutor(self.driver)
             results = []
             passed = failed = 0
             
-            for idx, action in enumerate(actions, 1):
-                logger.info(f"Executing action {idx}/{len(actions)}: {action.get('type')}")
+            total = len(actions)
+            idx = 0
+            
+            while idx < total:
                 start_time = time.time()
+                batch = list(itertools.takewhile(executor.is_batchable, actions[idx:]))
                 
-                result = executor.execute(action)
-                result['duration'] = round(time.time() - start_time, 3)
-                results.append(result)
+                step = []
+                if len(batch) > 1:
+                    logger.debug("Executing actions %d-%d/%d as a batch", idx + 1, idx + len(batch), total)
+                    step = executor.execute_batch(batch)
+                    # Batched actions share one round-trip, so they split its time evenly
+                    if step:
+                        duration = round((time.time() - start_time) / len(step), 3)
+                        for result in step:
+                            result['duration'] = duration
+                if not step or len(step) < len(batch):
+                    # The action the batch stopped on (or a non-batchable one) runs on its own
+                    action = actions[idx + len(step)]
+                    logger.debug("Executing action %d/%d: %s", idx + len(step) + 1, total, action.get('type'))
+                    start_time = time.time()
+                    result = executor.execute(action)
+                    result['duration'] = round(time.time() - start_time, 3)
+                    step.append(result)
                 
-                if result['status'] == 'passed':
-                    passed += 1
-                else:
-                    failed += 1
-                
-                # Update progress
-                with test_lock:
-                    if self.test_name in active_tests:
-                        active_tests[self.test_name].progress = idx
+                for result in step:
+                    results.append(result)
+                    
+                    if result['status'] == 'passed':
+                        passed += 1
+                    else:
+                        failed += 1
+                idx += len(step)
                 
-                time.sleep(Config.ACTION_DELAY)
+                # Update progress; swapped in under test_lock so SSE streams are notified
+                _update_status(self.test_name, progress=idx)
+            
+            for result in results:
+                result['timestamp'] = datetime.fromtimestamp(result['timestamp']).isoformat()
             
             # Build summary
-            total = len(actions)
             summary = {
                 'browser': self.browser,
                 'total': total,
@@ -488,16 +1026,16 @@ class TestRunner:
                 'duration': sum(r.get('duration', 0) for r in results)
             }
             
-            logger.info(f"Test completed - Passed: {passed}, Failed: {failed}")
+            logger.info("Test completed - Passed: %s, Failed: %s", passed, failed)
             
             return {
                 'summary': summary,
                 'details': results,
-                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                'timestamp': _now_str()
             }
             
         except Exception as e:
-            logger.error(f"Error running tests: {e}")
+            logger.error("Error running tests: %s", e)
             raise
         finally:
             self.cleanup()
@@ -506,173 +1044,186 @@ class TestRunner:
 class TestManager:
     """Manages test file operations"""
     
+    _history_cache = {}  # report path -> (report version, parsed history)
+    
     @staticmethod
     def sanitize_name(name: str) -> str:
         """Sanitize test name for filesystem"""
-        return "".join(c for c in name if c.isalnum() or c in (' ', '_', '-')).strip()
+        if name.isascii():
+            return name.translate(_ASCII_NAME_TABLE).strip()
+        return _UNSAFE_NAME_CHARS.sub("", name).strip()
     
     @staticmethod
     def get_test_dir(test_name: str) -> Path:
         """Get test directory path"""
-        return Path(Config.UPLOAD_FOLDER) / test_name
+        return UPLOAD_DIR / test_name
+    
+    @staticmethod
+    def get_report_path(test_name: str, ext: str = 'json') -> Path:
+        """Get report file path"""
+        return REPORTS_DIR / f'{test_name}_report.{ext}'
     
     @staticmethod
     def save_test_files(test_name: str, html_file, json_file) -> bool:
         """Save uploaded test files"""
+        # Validate JSON in memory so nothing is written for a bad upload
+        raw = json_file.read()
+        try:
+            TestManager.parse_actions(raw)
+        except ValueError:
+            return False
+        
         test_dir = TestManager.get_test_dir(test_name)
         test_dir.mkdir(exist_ok=True)
         
-        html_path = test_dir / 'test.html'
-        json_path = test_dir / 'actions.json'
-        
-        html_file.save(str(html_path))
-        json_file.save(str(json_path))
-        
-        # Validate JSON
+        html_file.save(str(test_dir / 'test.html'))
+        (test_dir / 'actions.json').write_bytes(raw)
+        return True
+    
+    @staticmethod
+    def load_actions(json_path) -> List[Dict[str, Any]]:
+        """Load and validate an actions file"""
+        with open(json_path, 'rb') as f:
+            return TestManager.parse_actions(f.read())
+    
+    @staticmethod
+    def parse_actions(raw) -> List[Dict[str, Any]]:
+        """Parse actions JSON and check that every entry is a typed action"""
+        actions = json_loads(raw)
+        if not isinstance(actions, list) or not all(
+            isinstance(a, dict) and isinstance(a.get('type'), str) for a in actions
+        ):
+            raise ValueError("Actions must be a list of objects with a 'type' field")
+        for a in actions:
+            delay = a.get('delay')
+            if delay is not None and (isinstance(delay, bool) or not isinstance(delay, (int, float)) or delay < 0):
+                raise ValueError(f"Action '{a['type']}' has an invalid 'delay' (expected milliseconds >= 0)")
+        return actions
+    
+    @staticmethod
+    def has_test_files(test_name: str) -> bool:
+        """Check that both test.html and actions.json exist with one directory read"""
         try:
-            with open(json_path, 'r') as f:
-                json.load(f)
-            return True
-        except json.JSONDecodeError:
-            shutil.rmtree(test_dir)
+            with os.scandir(TestManager.get_test_dir(test_name)) as entries:
+                names = {e.name for e in entries if e.is_file()}
+        except (FileNotFoundError, NotADirectoryError):
             return False
+        return {'test.html', 'actions.json'} <= names
     
     @staticmethod
     def list_tests() -> List[str]:
         """List all available tests"""
-        upload_dir = Path(Config.UPLOAD_FOLDER)
-        return sorted([d.name for d in upload_dir.iterdir() if d.is_dir()])
+        with os.scandir(UPLOAD_DIR) as entries:
+            return sorted(e.name for e in entries if e.is_dir(follow_symlinks=False))
     
     @staticmethod
     def delete_test(test_name: str) -> bool:
         """Delete a test"""
-        test_dir = TestManager.get_test_dir(test_name)
-        if test_dir.exists():
-            shutil.rmtree(test_dir)
-            return True
-        return False
+        try:
+            shutil.rmtree(TestManager.get_test_dir(test_name))
+        except FileNotFoundError:
+            return False
+        return True
     
     @staticmethod
     def save_report(test_name: str, results: Dict) -> str:
         """Save test report"""
-        report_path = Path(Config.REPORTS_FOLDER) / f'{test_name}_report.json'
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2)
-        logger.info(f"Report saved: {report_path}")
+        report_path = TestManager.get_report_path(test_name)
+        data = json_dumps(results)
+        write_atomic(report_path, lambda f: f.write(data))
+        logger.info("Report saved: %s", report_path)
         return str(report_path)
     
     @staticmethod
     def get_test_history(test_name: str) -> List[Dict]:
         """Get execution history for a test"""
-        report_path = Path(Config.REPORTS_FOLDER) / f'{test_name}_report.json'
-        if report_path.exists():
-            with open(report_path, 'r') as f:
-                return json.load(f)
-        return []
+        report_path = TestManager.get_report_path(test_name)
+        key = str(report_path)
+        version = TestManager.report_version(test_name)
+        if version is None:
+            TestManager._history_cache.pop(key, None)
+            return []
+        # One entry per report, replaced when the report is rewritten
+        cached = TestManager._history_cache.get(key)
+        if cached and cached[0] == version:
+            return cached[1]
+        history = json_loads(report_path.read_bytes())
+        TestManager._history_cache[key] = (version, history)
+        return history
+    
+    @staticmethod
+    def report_version(test_name: str) -> Optional[tuple]:
+        """Identify the current JSON report file, or None if there is none"""
+        try:
+            stat = TestManager.get_report_path(test_name).stat()
+        except FileNotFoundError:
+            return None
+        # write_atomic gives every rewrite a new inode, which also catches rewrites
+        # within one tick of a coarse-grained mtime
+        return stat.st_mtime_ns, stat.st_ino
+    
+    @staticmethod
+    def get_last_run(test_name: str) -> Dict:
+        """Get the most recent run from a test's history"""
+        history = TestManager.get_test_history(test_name)
+        if isinstance(history, list):
+            return history[-1] if history else {}
+        return history
+    
+    @staticmethod
+    def screenshot_src(path: str) -> str:
+        """Inline a screenshot as a data URI so the report needs no extra requests"""
+        try:
+            screenshot = Path(path)
+            if screenshot.stat().st_size <= Config.INLINE_SCREENSHOT_MAX_BYTES:
+                return "data:image/png;base64," + base64.b64encode(screenshot.read_bytes()).decode('ascii')
+        except OSError:
+            pass
+        return path
+    
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _report_template():
+        # Compiled once per process; skips the loader's per-call lookup and auto-reload stat
+        return app.jinja_env.get_template('report.html')
     
     @staticmethod
     def export_to_html_multi_browser(test_name: str, results: Dict) -> str:
         """Export multi-browser test results to HTML report"""
-        browsers_data = results.get('browsers', [])
-        summary = results.get('summary', {})
-        
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>Multi-Browser Test Report: {test_name}</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; margin: 20px; }}
-                .summary {{ background: #f0f0f0; padding: 15px; border-radius: 5px; margin-bottom: 20px; }}
-                .browser-section {{ margin: 20px 0; padding: 15px; border: 1px solid #ddd; border-radius: 5px; }}
-                .passed {{ color: green; }}
-                .failed {{ color: red; }}
-                table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
-                th, td {{ border: 1px solid #ddd; padding: 8px; text-align: left; }}
-                th {{ background-color: #4CAF50; color: white; }}
-                img {{ max-width: 300px; cursor: pointer; }}
-                .browser-header {{ background: #2196F3; color: white; padding: 10px; border-radius: 3px; }}
-            </style>
-        </head>
-        <body>
-            <h1>Multi-Browser Test Report: {test_name}</h1>
-            <div class="summary">
-                <h2>Overall Summary</h2>
-                <p><strong>Total Browsers:</strong> {summary.get('total_browsers', 0)}</p>
-                <p><strong>Total Tests:</strong> {summary.get('total_tests', 0)}</p>
-                <p><strong>Total Passed:</strong> <span class="passed">{summary.get('total_passed', 0)}</span></p>
-                <p><strong>Total Failed:</strong> <span class="failed">{summary.get('total_failed', 0)}</span></p>
-                <p><strong>Timestamp:</strong> {results.get('timestamp', 'N/A')}</p>
-            </div>
-        """
-        
-        for browser_result in browsers_data:
-            browser_summary = browser_result.get('summary', {})
-            browser_name = browser_summary.get('browser', 'Unknown')
-            
-            html_content += f"""
-            <div class="browser-section">
-                <div class="browser-header">
-                    <h2>{browser_name.upper()} Results</h2>
-                </div>
-                <div style="padding: 10px;">
-                    <p><strong>Total Tests:</strong> {browser_summary.get('total', 0)}</p>
-                    <p><strong>Passed:</strong> <span class="passed">{browser_summary.get('passed', 0)}</span></p>
-                    <p><strong>Failed:</strong> <span class="failed">{browser_summary.get('failed', 0)}</span></p>
-                    <p><strong>Success Rate:</strong> {browser_summary.get('success_rate', 0)}%</p>
-                    <p><strong>Duration:</strong> {browser_summary.get('duration', 0)}s</p>
-                </div>
-                
-                <h3>Test Details</h3>
-                <table>
-                    <thead>
-                        <tr>
-                            <th>#</th>
-                            <th>Action</th>
-                            <th>Selector</th>
-                            <th>Status</th>
-                            <th>Message</th>
-                            <th>Duration</th>
-                            <th>Screenshot</th>
-                        </tr>
-                    </thead>
-                    <tbody>
-            """
-            
-            for idx, detail in enumerate(browser_result.get('details', []), 1):
-                status_class = 'passed' if detail['status'] == 'passed' else 'failed'
-                screenshot = f"<img src='{detail['screenshot']}' alt='Screenshot'/>" if detail.get('screenshot') else 'N/A'
-                
-                html_content += f"""
-                        <tr>
-                            <td>{idx}</td>
-                            <td>{detail['action']}</td>
-                            <td>{detail.get('selector', 'N/A')}</td>
-                            <td class="{status_class}">{detail['status'].upper()}</td>
-                            <td>{detail['message']}</td>
-                            <td>{detail.get('duration', 0)}s</td>
-                            <td>{screenshot}</td>
-                        </tr>
-                """
-            
-            html_content += """
-                    </tbody>
-                </table>
-            </div>
-            """
-        
-        html_content += """
-        </body>
-        </html>
-        """
-        
-        report_path = Path(Config.REPORTS_FOLDER) / f'{test_name}_report.html'
-        with open(report_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        report_path = TestManager.get_report_path(test_name, 'html')
+        # Rendered by Jinja (autoescaped, streamed to disk) instead of string concatenation
+        stream = TestManager._report_template().stream(
+            test_name=test_name,
+            summary=results.get('summary', {}),
+            browsers=results.get('browsers', []),
+            timestamp=results.get('timestamp'),
+            screenshot_src=TestManager.screenshot_src
+        )
+        write_atomic(report_path, lambda f: stream.dump(f, encoding='utf-8'))
         
         return str(report_path)
 
 
+def _run_one(browser: str, headless: bool, test_name: str, html_path: Path, json_path: Path) -> Dict:
+    """Run a test on one browser, turning any failure into an empty result"""
+    try:
+        return TestRunner(browser, headless, test_name).run(str(html_path), str(json_path))
+    except Exception as e:
+        logger.error("Error on %s: %s", browser, e)
+        return {
+            'summary': {
+                'browser': browser,
+                'total': 0,
+                'passed': 0,
+                'failed': 0,
+                'success_rate': 0
+            },
+            'details': [],
+            'timestamp': _now_str(),
+            'error': str(e)
+        }
+
+
 # ==================== FLASK ROUTES ====================
 
 @app.route('/')
@@ -700,13 +1251,13 @@ def upload_files():
             return jsonify({'success': False, 'message': 'Both files required'})
         
         if TestManager.save_test_files(test_name, html_file, json_file):
-            logger.info(f"Test '{test_name}' uploaded successfully")
+            logger.info("Test '%s' uploaded successfully", test_name)
             return jsonify({'success': True, 'message': 'Files uploaded successfully'})
         else:
             return jsonify({'success': False, 'message': 'Invalid JSON format'})
         
     except Exception as e:
-        logger.error(f"Upload error: {e}")
+        logger.error("Upload error: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 
@@ -717,7 +1268,7 @@ def list_tests():
         tests = TestManager.list_tests()
         return jsonify({'tests': tests})
     except Exception as e:
-        logger.error(f"List error: {e}")
+        logger.error("List error: %s", e)
         return jsonify({'tests': [], 'error': str(e)})
 
 
@@ -729,7 +1280,8 @@ def run_test():
         test_name = data.get('test_name')
         browser = data.get('browser', 'chrome')
         headless = data.get('headless', False)
-        parallel = data.get('parallel', False)
+        # Clients may opt out of parallel runs, but can't override the server config
+        parallel = data.get('parallel', True) and Config.PARALLEL_EXECUTION
         
         if not test_name:
             return jsonify({'error': 'Test name required'})
@@ -738,7 +1290,7 @@ def run_test():
         html_path = test_dir / 'test.html'
         json_path = test_dir / 'actions.json'
         
-        if not html_path.exists() or not json_path.exists():
+        if not TestManager.has_test_files(test_name):
             return jsonify({'error': 'Test files not found'})
         
         # Initialize test status
@@ -751,81 +1303,39 @@ def run_test():
                 start_time=time.time(),
                 browser=browser
             )
+            status_changed.notify_all()
         
         # Run tests
         if browser == "all":
             browsers = ["chrome", "firefox", "edge"]
             
-            if parallel and Config.PARALLEL_EXECUTION:
-                # Parallel execution
-                results = []
-                with ThreadPoolExecutor(max_workers=min(len(browsers), Config.MAX_PARALLEL_TESTS)) as executor:
-                    future_to_browser = {
-                        executor.submit(
-                            TestRunner(b, headless, test_name).run,
-                            str(html_path),
-                            str(json_path)
-                        ): b for b in browsers
-                    }
-                    
-                    for future in as_completed(future_to_browser):
-                        b = future_to_browser[future]
-                        try:
-                            result = future.result()
-                            results.append(result)
-                        except Exception as e:
-                            logger.error(f"Error on {b}: {e}")
-                            results.append({
-                                'summary': {
-                                    'browser': b,
-                                    'total': 0,
-                                    'passed': 0,
-                                    'failed': 0,
-                                    'success_rate': 0
-                                },
-                                'details': [],
-                                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                                'error': str(e)
-                            })
-            else:
-                # Sequential execution
-                results = []
-                for b in browsers:
-                    try:
-                        logger.info(f"Running test '{test_name}' on {b}")
-                        runner = TestRunner(browser=b, headless=headless, test_name=test_name)
-                        result = runner.run(str(html_path), str(json_path))
-                        results.append(result)
-                    except Exception as e:
-                        logger.error(f"Error on {b}: {e}")
-                        results.append({
-                            'summary': {
-                                'browser': b,
-                                'total': 0,
-                                'passed': 0,
-                                'failed': 0,
-                                'success_rate': 0
-                            },
-                            'details': [],
-                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            'error': str(e)
-                        })
+            # Each browser owns its own WebDriver process, so runs are I/O-bound on Selenium RPC
+            futures = []
+            for b in browsers:
+                future = _TEST_EXECUTOR.submit(_run_one, b, headless, test_name, html_path, json_path)
+                futures.append(future)
+                if not parallel:
+                    wait([future])
+            
+            results = [future.result() for future in as_completed(futures)]
+            
+            # Keep report order stable regardless of completion order
+            results.sort(key=lambda r: browsers.index(r['summary']['browser']))
         else:
-            logger.info(f"Running test '{test_name}' on {browser}")
+            logger.info("Running test '%s' on %s", test_name, browser)
+            # Errors propagate so the response carries a top-level 'error' and the status is 'failed'
             runner = TestRunner(browser=browser, headless=headless, test_name=test_name)
-            results = runner.run(str(html_path), str(json_path))
+            results = [runner.run(str(html_path), str(json_path))]
         
         # Update test status
-        with test_lock:
-            if test_name in active_tests:
-                active_tests[test_name].status = 'completed'
+        _update_status(test_name, status='completed')
 
         # *** FIX: Create combined report structure for multi-browser tests ***
         combined_report = {
             'test_name': test_name,
             'browser': 'all',
             'browsers': results,  # List of browser results
-            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'timestamp': _now_str(),
             'summary': {
                 'total_browsers': len(results),
                 'total_tests': sum(r.get('summary', {}).get('total', 0) for r in results),
@@ -834,33 +1344,61 @@ def run_test():
             }
         }
 
-        # Save reports using multi-browser method
-        TestManager.save_report(test_name, combined_report)
-        TestManager.export_to_html_multi_browser(test_name, combined_report)
+        # Save reports on the background writer so the response isn't held up by disk I/O
+        submit_io(TestManager.save_report, test_name, combined_report)
+        submit_io(TestManager.export_to_html_multi_browser, test_name, combined_report)
 
         return jsonify(combined_report)
         
     except Exception as e:
-        logger.error(f"Test execution error: {e}")
-        with test_lock:
-            if test_name in active_tests:
-                active_tests[test_name].status = 'failed'
+        logger.error("Test execution error: %s", e)
+        _update_status(test_name, status='failed')
         return jsonify({'error': str(e)})
 
 
+def _status_payload(status: TestStatus) -> Dict:
+    return {
+        **status.to_dict(),
+        'elapsed_time': round(time.time() - status.start_time, 2)
+    }
+
+
 @app.route('/test_status/<test_name>')
 def test_status(test_name):
     """Get current test execution status"""
-    with test_lock:
-        if test_name in active_tests:
-            status = active_tests[test_name]
-            elapsed = time.time() - status.start_time
-            return jsonify({
-                **status.to_dict(),
-                'elapsed_time': round(elapsed, 2)
-            })
-        else:
-            return jsonify({'error': 'Test not found'}), 404
+    # Snapshots are immutable, so reading one needs no lock
+    status = active_tests.get(test_name)
+    if status:
+        return jsonify(_status_payload(status))
+    else:
+        return jsonify({'error': 'Test not found'}), 404
+
+
+@app.route('/test_status/<test_name>/stream')
+def test_status_stream(test_name):
+    """Push status updates as Server-Sent Events until the test finishes"""
+    if test_name not in active_tests:
+        return jsonify({'error': 'Test not found'}), 404
+    
+    def events():
+        last = None
+        while True:
+            with status_changed:
+                status_changed.wait_for(lambda: active_tests.get(test_name) is not last,
+                                        timeout=Config.STATUS_STREAM_KEEPALIVE)
+                status = active_tests.get(test_name)
+            if status is None:
+                return
+            if status is last:
+                yield ': keep-alive\n\n'
+                continue
+            last = status
+            yield f"data: {json_dumps(_status_payload(status)).decode('utf-8')}\n\n"
+            if status.status != 'running':
+                return
+    
+    return Response(events(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 
 @app.route('/compare_tests', methods=['POST'])
@@ -872,6 +1410,14 @@ def compare_tests():
         if not test_names:
             return jsonify({'error': 'Test names required'})
         
+        # The comparison only changes when one of the reports is rewritten
+        versions = [TestManager.report_version(test_name) for test_name in test_names]
+        etag = hashlib.blake2b(json_dumps([test_names, versions]), digest_size=16).hexdigest()
+        if request.if_none_match.contains(etag):
+            response = app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
         comparison = []
         for test_name in test_names:
             history = TestManager.get_test_history(test_name)
@@ -881,10 +1427,12 @@ def compare_tests():
                     'history': history
                 })
         
-        return jsonify({'comparison': comparison})
+        response = jsonify({'comparison': comparison})
+        response.set_etag(etag)
+        return response
         
     except Exception as e:
-        logger.error(f"Comparison error: {e}")
+        logger.error("Comparison error: %s", e)
         return jsonify({'error': str(e)})
 
 
@@ -892,13 +1440,19 @@ def compare_tests():
 def download_html_report(test_name):
     """Download HTML report"""
     try:
-        report_path = Path(Config.REPORTS_FOLDER) / f'{test_name}_report.html'
-        if report_path.exists():
-            return send_file(str(report_path), as_attachment=True)
-        else:
-            return jsonify({'error': 'HTML report not found'}), 404
+        report_path = TestManager.get_report_path(test_name, 'html')
+        return send_file(
+            str(report_path),
+            as_attachment=True,
+            mimetype='text/html',
+            conditional=True,
+            etag=True,
+            max_age=0
+        )
+    except FileNotFoundError:
+        return jsonify({'error': 'HTML report not found'}), 404
     except Exception as e:
-        logger.error(f"Download error: {e}")
+        logger.error("Download error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -913,16 +1467,11 @@ def retry_failed():
             return jsonify({'error': 'Test name required'})
         
         # Get previous test results
-        history = TestManager.get_test_history(test_name)
-        if not history:
+        last_run = TestManager.get_last_run(test_name)
+        if not last_run:
             return jsonify({'error': 'No test history found'})
         
         # Extract failed actions
-        if isinstance(history, list):
-            last_run = history[-1] if history else {}
-        else:
-            last_run = history
-        
         failed_actions = [
             detail for detail in last_run.get('details', [])
             if detail['status'] == 'failed'
@@ -935,8 +1484,8 @@ def retry_failed():
         test_dir = TestManager.get_test_dir(test_name)
         retry_json_path = test_dir / 'retry_actions.json'
         
-        with open(retry_json_path, 'w') as f:
-            json.dump(failed_actions, f, indent=2)
+        # Serialize in memory so the file is written in a single call
+        retry_json_path.write_bytes(json_dumps(failed_actions))
         
         # Run retry test
         browser = data.get('browser', 'chrome')
@@ -952,7 +1501,7 @@ def retry_failed():
         return jsonify(results)
         
     except Exception as e:
-        logger.error(f"Retry error: {e}")
+        logger.error("Retry error: %s", e)
         return jsonify({'error': str(e)})
 
 
@@ -965,13 +1514,13 @@ def delete_test():
             return jsonify({'success': False, 'message': 'Test name required'})
         
         if TestManager.delete_test(test_name):
-            logger.info(f"Test '{test_name}' deleted")
+            logger.info("Test '%s' deleted", test_name)
             return jsonify({'success': True, 'message': 'Test deleted successfully'})
         else:
             return jsonify({'success': False, 'message': 'Test not found'})
         
     except Exception as e:
-        logger.error(f"Delete error: {e}")
+        logger.error("Delete error: %s", e)
         return jsonify({'success': False, 'message': str(e)})
 
 
@@ -979,13 +1528,21 @@ def delete_test():
 def download_report(test_name):
     """Download test report"""
     try:
-        report_path = Path(Config.REPORTS_FOLDER) / f'{test_name}_report.json'
-        if report_path.exists():
-            return send_file(str(report_path), as_attachment=True)
-        else:
-            return jsonify({'error': 'Report not found'}), 404
+        report_path = TestManager.get_report_path(test_name)
+        # Conditional GET lets repeat downloads of an unchanged report return 304;
+        # a missing file surfaces from send_file's own stat() instead of a separate check
+        return send_file(
+            str(report_path),
+            as_attachment=True,
+            mimetype='application/json',
+            conditional=True,
+            etag=True,
+            max_age=0
+        )
+    except FileNotFoundError:
+        return jsonify({'error': 'Report not found'}), 404
     except Exception as e:
-        logger.error(f"Download error: {e}")
+        logger.error("Download error: %s", e)
         return jsonify({'error': str(e)}), 500
 
 
@@ -996,4 +1553,5 @@ def request_entity_too_large(error):
 
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000, host='0.0.0.0')
\ No newline at end of file
+    # Development server only; set FLASK_DEBUG=1 for the reloader and debugger
+    app.run(debug=os.environ.get('FLASK_DEBUG') == '1', port=5000, host='0.0.0.0')
\ No newline at end of file
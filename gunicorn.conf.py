@@ -0,0 +1,23 @@
+"""
+Gunicorn settings for the test automation app
+Run: gunicorn -c gunicorn.conf.py wsgi:application
+"""
+
+import os
+
+bind = os.environ.get('ATF_BIND', '0.0.0.0:5000')
+
+# Import the app (templates, precomputed tables) once in the master; workers inherit it on fork.
+# Driver pools, the test executor and the background writer all start lazily per process.
+preload_app = True
+
+# Threaded workers: test runs block on Selenium, not on the CPU.
+# Test status (active_tests) lives in process memory, so /test_status and its SSE stream
+# only see runs started in the same worker: keep one worker and scale with threads.
+# Each open status stream holds a thread for as long as the test runs.
+worker_class = 'gthread'
+workers = int(os.environ.get('ATF_WORKERS', 1))
+threads = int(os.environ.get('ATF_THREADS', 16))
+
+# A /run_test request lasts as long as the browser run, so allow well beyond the 30s default
+timeout = int(os.environ.get('ATF_TIMEOUT', 300))
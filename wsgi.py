@@ -0,0 +1,6 @@
+"""
+WSGI entry point for the test automation app
+Run: gunicorn -c gunicorn.conf.py wsgi:application
+"""
+
+from app import app as application